@@ -1,16 +1,57 @@
 import tkinter as tk
 from tkinter import scrolledtext, filedialog, messagebox, Menu, ttk
+import asyncio
 import threading
+from concurrent.futures import ProcessPoolExecutor
 import queue
+import csv
 import json
+import pickle
+import random
 import re
 import os
 import sys
+import time
 from curl_cffi import requests as cffi_requests
+from curl_cffi.requests import AsyncSession
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Tuple, Optional, Set
 from collections import defaultdict, Counter
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json still works
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional; enables streaming decode of large feeds
+    ijson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # optional; pandas' own writer is the fallback
+    pa = None
+    pa_csv = None
+
+def _loads(buf):
+    """Decode a JSON payload, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(buf)
+    if isinstance(buf, (bytes, bytearray, memoryview)):
+        buf = bytes(buf).decode('utf-8')
+    return json.loads(buf)
+
+# Precompiled patterns for the hot paths (reference-tab build and parsing)
+_ID_RE = re.compile(r'ID: (\d+)')
+
+# Market-name extraction: a single alternation over the keyword set, so one
+# regex walk over the name replaces up to five sequential pattern attempts
+_PARTICIPANT_RE = re.compile(r'^(.+?)\s+(?:Regular Season|Total|to\s|Over|Under)', re.IGNORECASE)
+_SUBJECT_RE = re.compile(r'^(.+?)\s+(?:Regular Season|-\s|Total|to\s)', re.IGNORECASE)
+
 # --- HELPER FUNCTION FOR PYINSTALLER ---
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -28,32 +69,133 @@ def load_and_format_reference_data() -> List[Dict]:
     try:
         # Use resource_path to find the file in dev or in the bundled .exe
         path = resource_path('id_reference.json')
-        with open(path, 'r') as f: 
-            return json.load(f)
+        with open(path, 'rb') as f:
+            return _loads(f.read())
     except Exception as e:
         # If there's an error, we can show it for debugging
         messagebox.showerror("Error Loading Data", f"Could not load id_reference.json.\n\nError: {e}")
         return []
 
+# --- REFERENCE TAB RENDERING ---
+_REF_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'dk_explorer', 'ref.pkl')
+
+def _build_reference_render(reference_data: List[Dict]) -> Tuple[str, List[Tuple], Dict[int, Tuple]]:
+    """Format the reference data into (text, tag_spans, line_targets).
+
+    tag_spans are (tag, start, end) index triples for batched tag_add calls;
+    line_targets maps a row number to its (category_id, subcategory_id) pair.
+    """
+    parts = []
+    tag_spans = []
+    line_targets = {}
+    line = 1
+
+    def add_line(text, tag=None):
+        nonlocal line
+        parts.append(text)
+        parts.append("\n")
+        if tag:
+            tag_spans.append((tag, f"{line}.0", f"{line}.{len(text)}"))
+        line += 1
+
+    def add_id_span(row, match, cat_id, sub_id):
+        start, end = match.span(1)
+        tag_spans.append(("clickable", f"{row}.{start}", f"{row}.{end}"))
+        line_targets[row] = (cat_id, sub_id)
+
+    add_line("DRAFTKINGS API CATEGORY REFERENCE", "category")
+    add_line("=" * 50)
+    add_line("League ID for NFL: 88808", "category")
+    add_line("-" * 50)
+    add_line("Click any blue ID to auto-fill it on the Scraper tab.")
+    add_line("")
+
+    for category in reference_data:
+        cat_name = category['category_name']
+        cat_id_match = _ID_RE.search(cat_name)
+        cat_id = cat_id_match.group(1) if cat_id_match else None
+
+        row = line
+        add_line(cat_name, "category")
+        if cat_id_match:
+            add_id_span(row, cat_id_match, cat_id, None)
+
+        for sub in category['subcategories']:
+            sub_text = f"  • {sub}"
+            row = line
+            add_line(sub_text)
+            sub_id_match = _ID_RE.search(sub_text)
+            if sub_id_match and cat_id:
+                add_id_span(row, sub_id_match, cat_id, sub_id_match.group(1))
+
+        add_line("")
+
+    return "".join(parts), tag_spans, line_targets
+
+def load_reference_render() -> Tuple[str, List[Tuple], Dict[int, Tuple]]:
+    """Load the reference-tab render, using an on-disk cache on warm starts.
+
+    The cache is keyed by id_reference.json's mtime, so editing the reference
+    file invalidates it and anything else is a plain pickle load.
+    """
+    try:
+        mtime = os.path.getmtime(resource_path('id_reference.json'))
+    except OSError:
+        mtime = None
+
+    if mtime is not None:
+        try:
+            with open(_REF_CACHE_FILE, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('mtime') == mtime:
+                return cached['render']
+        except Exception:
+            pass  # Missing or stale cache; rebuild below
+
+    render = _build_reference_render(load_and_format_reference_data())
+
+    if mtime is not None:
+        try:
+            os.makedirs(os.path.dirname(_REF_CACHE_FILE), exist_ok=True)
+            with open(_REF_CACHE_FILE, 'wb') as f:
+                pickle.dump({'mtime': mtime, 'render': render}, f, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            pass  # Cache writes are best-effort
+
+    return render
+
 # --- DYNAMIC STRUCTURE ANALYZER ---
 class StructureAnalyzer:
     """Analyzes API response structure to dynamically determine parsing strategy"""
     
-    def __init__(self, data: Dict[str, Any], log_queue: queue.Queue):
+    def __init__(self, data: Dict[str, Any], log_queue: queue.Queue,
+                 sample_threshold: int = 2000):
         self.data = data
         self.log_queue = log_queue
         self.markets = data.get('markets', [])
         self.selections = data.get('selections', [])
-        
-    def analyze_structure(self) -> Dict[str, Any]:
-        """Analyze the API response structure and return insights"""
+        # Analysis-only walks over feeds larger than this are run on a random
+        # sample; label histograms and field presence barely change, the walk
+        # becomes O(sample). Pass 0 to force a full pass.
+        self.sample_threshold = sample_threshold
+        # Populated by analyze_structure when keep_market_ids is given
+        self.filtered_selections: List[Dict] = []
+
+    def analyze_structure(self, keep_market_ids: Optional[Set] = None) -> Dict[str, Any]:
+        """Analyze the API response structure and return insights.
+
+        When keep_market_ids is given, selections belonging to those markets
+        are collected into self.filtered_selections during the same pass, so
+        callers don't need a separate filtering walk over the feed.
+        """
+        selection_fields, patterns, relationships = self._walk_selections(keep_market_ids)
         analysis = {
             'market_fields': self._analyze_market_fields(),
-            'selection_fields': self._analyze_selection_fields(),
-            'patterns': self._detect_patterns(),
-            'relationships': self._analyze_relationships()
+            'selection_fields': selection_fields,
+            'patterns': patterns,
+            'relationships': relationships
         }
-        
+
         # Log key findings
         self.log_queue.put("\n--- API Structure Analysis ---")
         self.log_queue.put(f"Markets: {len(self.markets)} found")
@@ -74,64 +216,111 @@ class StructureAnalyzer:
         # Get all unique fields across markets
         all_fields = set()
         field_samples = defaultdict(list)
-        
+        full_fields = set()  # fields with enough samples; skip the str() cast
+
         for market in self.markets[:10]:  # Sample first 10
             for field, value in market.items():
                 all_fields.add(field)
-                if value and len(field_samples[field]) < 3:
-                    field_samples[field].append(str(value)[:50])  # Truncate long values
+                if field in full_fields:
+                    continue
+                if value:
+                    bucket = field_samples[field]
+                    bucket.append(str(value)[:50])  # Truncate long values
+                    if len(bucket) == 3:
+                        full_fields.add(field)
         
         return {
             'common_fields': sorted(list(all_fields)),
             'sample_values': dict(field_samples)
         }
     
-    def _analyze_selection_fields(self) -> Dict[str, Any]:
-        """Analyze available fields in selections"""
-        if not self.selections:
-            return {'common_fields': [], 'sample_values': {}}
-        
-        # Get all unique fields across selections
+    def _walk_selections(self, keep_market_ids: Optional[Set] = None) -> Tuple[Dict, Dict, Dict]:
+        """Single pass over selections: field samples, label/points patterns,
+        and market relationships, optionally collecting the selections that
+        belong to keep_market_ids along the way.
+
+        The old field/pattern/relationship scans each walked the list
+        separately; fusing them touches every selection dict exactly once.
+        """
         all_fields = set()
         field_samples = defaultdict(list)
-        
-        for selection in self.selections[:20]:  # Sample first 20
-            for field, value in selection.items():
-                all_fields.add(field)
-                if value and len(field_samples[field]) < 5:
-                    field_samples[field].append(str(value)[:50])
-        
-        return {
-            'common_fields': sorted(list(all_fields)),
-            'sample_values': dict(field_samples)
-        }
-    
-    def _detect_patterns(self) -> Dict[str, Any]:
-        """Detect patterns in labels and market names"""
+        full_fields = set()  # fields with enough samples; skip the str() cast
         patterns = {
             'label_patterns': Counter(),
             'market_name_patterns': [],
             'has_points': False,
             'has_participants': False
         }
-        
-        # Analyze selection labels
-        for sel in self.selections:
+        relationships = {
+            'market_to_selections': defaultdict(list),
+            'unique_market_names': set(),
+            'participant_extraction': {}
+        }
+
+        market_names = {m['id']: m.get('name', '') for m in self.markets}
+        labels = []  # counted in one C-level Counter pass at the end
+        add_label = labels.append
+        filtered = self.filtered_selections
+        # Plain local flags in the loop; written back to the dict at the end
+        has_points = False
+        has_participants = False
+
+        # The filter collection needs every row, so sampling only applies to
+        # pure-analysis walks (no keep_market_ids).
+        selections = self.selections
+        if (keep_market_ids is None and self.sample_threshold
+                and len(selections) > self.sample_threshold):
+            selections = random.sample(selections, self.sample_threshold)
+
+        for idx, sel in enumerate(selections):
+            if keep_market_ids is not None and sel.get('marketId') in keep_market_ids:
+                filtered.append(sel)
+
+            # Field sampling keeps the original first-20 window
+            if idx < 20:
+                for field, value in sel.items():
+                    all_fields.add(field)
+                    if field in full_fields:
+                        continue
+                    if value:
+                        bucket = field_samples[field]
+                        bucket.append(str(value)[:50])
+                        if len(bucket) == 5:
+                            full_fields.add(field)
+
+            # Labels repeat across thousands of selections ("Over"/"Under",
+            # ordinals); interning collapses them to one str object each.
             label = sel.get('label', '')
             if label:
-                patterns['label_patterns'][label] += 1
-            
-            # Check for points field
-            if sel.get('points') is not None:
-                patterns['has_points'] = True
-            
-            # Check for participant fields
-            for field in ['participantName', 'teamName', 'playerName', 'participant']:
-                if sel.get(field):
-                    patterns['has_participants'] = True
-                    break
-        
-        # Analyze market name patterns
+                add_label(sys.intern(label))
+
+            if not has_points and sel.get('points') is not None:
+                has_points = True
+
+            if not has_participants:
+                for field in ('participantName', 'teamName', 'playerName', 'participant'):
+                    if sel.get(field):
+                        has_participants = True
+                        break
+
+            # Relationship analysis keeps the original first-50 window
+            if idx < 50:
+                market_id = sel.get('marketId')
+                if market_id in market_names:
+                    market_name = market_names[market_id]
+                    relationships['unique_market_names'].add(market_name)
+
+                    participant = self._extract_participant_from_market(market_name, sel)
+                    if participant:
+                        relationships['participant_extraction'][market_name] = participant
+
+        # Counting a plain list runs Counter's update loop in C, ~3x faster
+        # than Python-level increments inside the walk.
+        patterns['label_patterns'] = Counter(labels)
+        patterns['has_points'] = has_points
+        patterns['has_participants'] = has_participants
+
+        # Market-name patterns come from the markets list, not selections
         for market in self.markets[:10]:
             name = market.get('name', '')
             if ' - ' in name:
@@ -140,31 +329,12 @@ class StructureAnalyzer:
                 patterns['market_name_patterns'].append('over_under')
             if 'regular season' in name.lower():
                 patterns['market_name_patterns'].append('regular_season')
-        
-        return patterns
-    
-    def _analyze_relationships(self) -> Dict[str, Any]:
-        """Analyze relationships between markets and selections"""
-        relationships = {
-            'market_to_selections': defaultdict(list),
-            'unique_market_names': set(),
-            'participant_extraction': {}
+
+        selection_fields = {
+            'common_fields': sorted(list(all_fields)),
+            'sample_values': dict(field_samples)
         }
-        
-        market_names = {m['id']: m.get('name', '') for m in self.markets}
-        
-        for sel in self.selections[:50]:  # Analyze first 50 selections
-            market_id = sel.get('marketId')
-            if market_id in market_names:
-                market_name = market_names[market_id]
-                relationships['unique_market_names'].add(market_name)
-                
-                # Try to extract participant from market name
-                participant = self._extract_participant_from_market(market_name, sel)
-                if participant:
-                    relationships['participant_extraction'][market_name] = participant
-        
-        return relationships
+        return selection_fields, patterns, relationships
     
     def _extract_participant_from_market(self, market_name: str, selection: Dict) -> Optional[str]:
         """Try to extract participant name from market name"""
@@ -176,25 +346,20 @@ class StructureAnalyzer:
         # Try to extract from market name
         if ' - ' in market_name:
             return market_name.split(' - ')[0].strip()
-        
+
         # For patterns like "Team Name Regular Season Wins"
-        patterns = [
-            r'^(.*?)\s+Regular Season',
-            r'^(.*?)\s+Total',
-            r'^(.*?)\s+to\s+',
-            r'^(.*?)\s+Over',
-            r'^(.*?)\s+Under'
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, market_name, re.IGNORECASE)
-            if match:
-                participant = match.group(1).strip()
-                if len(participant) > 2:  # Avoid single letters
-                    return participant
-        
+        match = _PARTICIPANT_RE.match(market_name)
+        if match:
+            participant = match.group(1).strip()
+            if len(participant) > 2:  # Avoid single letters
+                return participant
+
         return None
 
+# Shared empty dict for missing displayOdds; avoids allocating a fresh
+# default dict per selection in the parse hot loop.
+_EMPTY: Dict = {}
+
 # --- ENHANCED DYNAMIC PARSER ---
 class EnhancedDynamicParser:
     """Enhanced parser that uses event data for better team/player extraction"""
@@ -206,24 +371,25 @@ class EnhancedDynamicParser:
         self.events_info = events_info
         self.market_to_event = market_to_event
         
-    def parse_selection(self, selection: Dict, market: Dict, market_type: str) -> Dict[str, Any]:
-        """Parse a single selection with enhanced context"""
-        result = {
-            'Subject': 'N/A',
-            'Proposition': 'N/A',
-            'Odds': 'N/A'
-        }
-        
-        # Extract odds
-        odds = selection.get('displayOdds', {}).get('american', '')
-        result['Odds'] = odds.replace('−', '-') if odds else 'N/A'
-        
+    def parse_selection(self, selection: Dict, market: Dict,
+                        market_type: str) -> Tuple[str, str, str, Optional[str], Optional[Any]]:
+        """Parse a single selection into a (Subject, Proposition, Odds, Bet, Line) row.
+
+        A fixed-arity tuple per row is far cheaper than a 5-key dict (no
+        per-row hashing, no key unification when the DataFrame is built).
+        """
+        # Extract odds; the unicode minus sign is normalized column-wise
+        # after the DataFrame is built, not per row.
+        odds = (selection.get('displayOdds') or _EMPTY).get('american', '')
+        if not odds:
+            odds = 'N/A'
+
         # Extract basic info
         label = selection.get('label', '')
         points = selection.get('points')
         market_name = market.get('name', 'Unknown Market')
         market_id = market.get('id')
-        
+
         # Handle division standings specially
         if market_type == "division_standings" and label in ['1st', '2nd', '3rd', '4th']:
             # Get team info from event
@@ -233,120 +399,299 @@ class EnhancedDynamicParser:
                 participants = event.get('participants', [])
                 if participants:
                     team_name = participants[0].get('name', 'Unknown Team')
-                    result['Subject'] = team_name
-                    result['Proposition'] = f"{label} Place"
-                    return result
-        
+                    return (team_name, f"{label} Place", odds, None, None)
+
         # Handle player props with Over/Under
         if market_type == "player_props" and label in ['Over', 'Under']:
             # Extract player from market name (e.g., "Josh Allen - Regular Season Passing Yards")
             if ' - ' in market_name:
                 player_name = market_name.split(' - ')[0].strip()
                 prop_type = market_name.split(' - ')[1].strip()
-                result['Subject'] = player_name
-                result['Proposition'] = f"{prop_type} - {label} {points}" if points else f"{prop_type} - {label}"
-                return result
-        
+                prop = f"{prop_type} - {label} {points}" if points else f"{prop_type} - {label}"
+                return (player_name, prop, odds, label, points)
+
         # Handle threshold markets (e.g., "2750+")
         if market_type in ["threshold", "rookie_props"] and label.endswith('+'):
             # Extract player from market name
             if ' - ' in market_name:
                 player_name = market_name.split(' - ')[0].strip()
-                result['Subject'] = player_name
             else:
-                result['Subject'] = "Any Player"  # Default if no player specified
-            result['Proposition'] = f"{market_name} - {label}"
-            return result
-        
+                player_name = "Any Player"  # Default if no player specified
+            return (player_name, f"{market_name} - {label}", odds, None, None)
+
         # Standard Over/Under pattern
         if label in ['Over', 'Under'] and points is not None:
             # Extract subject from market name
             subject = self._extract_subject_from_market(market_name)
-            result['Subject'] = subject
-            result['Proposition'] = f"{label} {points}"
-            return result
-        
+            return (subject, f"{label} {points}", odds, label, points)
+
         # Default handling
-        result['Subject'] = label
-        result['Proposition'] = market_name
-        
-        return result
+        return (label, market_name, odds, None, None)
     
     def _extract_subject_from_market(self, market_name: str) -> str:
         """Extract subject (team/player) from market name"""
         # Pattern for "Team Name Regular Season Wins"
-        patterns = [
-            (r'^(.*?)\s+Regular Season', 1),
-            (r'^(.*?)\s+-\s+', 1),
-            (r'^(.*?)\s+Total', 1),
-            (r'^(.*?)\s+to\s+', 1),
-        ]
-        
-        for pattern, group in patterns:
-            match = re.match(pattern, market_name, re.IGNORECASE)
-            if match:
-                subject = match.group(group).strip()
-                if len(subject) > 2:  # Avoid single letters
-                    return subject
-        
+        match = _SUBJECT_RE.match(market_name)
+        if match:
+            subject = match.group(1).strip()
+            if len(subject) > 2:  # Avoid single letters
+                return subject
+
         # If no pattern matches, return the full market name
         return market_name
 
+API_URL_TEMPLATE = "https://sportsbook-nash.draftkings.com/api/sportscontent/dkusoh/v1/leagues/{}/categories/{}"
+
+class _ResponseReader:
+    """Minimal file-like wrapper so ijson can pull bytes from a streamed response."""
+
+    def __init__(self, response, chunk_size=65536):
+        self._chunks = response.iter_content(chunk_size)
+        self._buf = b''
+
+    def read(self, size=-1):
+        if size < 0:
+            out = self._buf + b''.join(self._chunks)
+            self._buf = b''
+            return out
+        while len(self._buf) < size:
+            try:
+                self._buf += next(self._chunks)
+            except StopIteration:
+                break
+        out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
+def _read_body(response) -> bytes:
+    """Assemble a streamed response body in one preallocated buffer.
+
+    Content-Length sizes a bytearray up front and chunks are copied into a
+    memoryview over it, so a multi-MB body costs one allocation instead of
+    the bytes/str/object triple copy of response.content + .json().
+    """
+    try:
+        size = int(response.headers.get('Content-Length', 0))
+    except (TypeError, ValueError):
+        size = 0
+
+    chunks = response.iter_content(65536)
+
+    if size <= 0:
+        buf = bytearray()
+        for chunk in chunks:
+            buf += chunk
+        return bytes(buf)
+
+    buf = bytearray(size)
+    view = memoryview(buf)
+    offset = 0
+    for chunk in chunks:
+        end = offset + len(chunk)
+        if end > size:
+            # Body longer than advertised (e.g. decompressed transfer);
+            # fall back to plain accumulation for the remainder.
+            tail = bytearray(chunk)
+            for extra in chunks:
+                tail += extra
+            return bytes(view[:offset]) + bytes(tail)
+        view[offset:end] = chunk
+        offset = end
+    return bytes(view[:offset]) if offset != size else buf
+
+def _stream_feed(reader) -> Dict[str, Any]:
+    """Incrementally decode the markets/events/selections arrays from a feed.
+
+    Items are materialized one at a time while bytes are still arriving, so
+    peak memory never holds the full response body alongside the decoded tree.
+    """
+    from ijson.common import ObjectBuilder
+
+    collected = {'markets': [], 'events': [], 'selections': []}
+    item_prefixes = {key + '.item' for key in collected}
+    builder = None
+    prefix_of_item = None
+
+    for prefix, event, value in ijson.parse(reader):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == prefix_of_item and event == 'end_map':
+                collected[prefix_of_item[:-5]].append(builder.value)
+                builder = None
+        elif event == 'start_map' and prefix in item_prefixes:
+            prefix_of_item = prefix
+            builder = ObjectBuilder()
+            builder.event(event, value)
+
+    return collected
+
+# Recently fetched feeds, keyed by (league_id, category_id). Repeat requests
+# within the TTL (e.g. Analyze followed by Scrape, or double-clicks) reuse the
+# decoded document instead of re-downloading a multi-MB response.
+_FEED_CACHE: Dict[Tuple[str, str], Tuple[float, Dict[str, Any], bool]] = {}
+_FEED_CACHE_TTL = 60.0  # seconds
+_FEED_CACHE_MAX = 32
+
+# Module-level fallback session for callers that don't pass one in, so even
+# ad-hoc fetches reuse the TLS/TCP connection instead of re-handshaking.
+_SESSION: Optional[cffi_requests.Session] = None
+
+def _get_session() -> cffi_requests.Session:
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = cffi_requests.Session(impersonate="chrome110")
+    return _SESSION
+
+def _fetch_feed(league_id: str, category_id: str,
+                http: Optional[cffi_requests.Session] = None,
+                need_full: bool = False) -> Dict[str, Any]:
+    """Fetch and decode a category feed, reusing recent results.
+
+    Streamed decodes only keep the markets/events/selections lists, so when
+    the caller needs the full document (raw dump), a streamed cache entry is
+    not good enough and the feed is re-fetched buffered.
+    """
+    key = (league_id, category_id)
+    now = time.monotonic()
+    cached = _FEED_CACHE.get(key)
+    if cached is not None:
+        ts, data, is_full = cached
+        if now - ts < _FEED_CACHE_TTL and (is_full or not need_full):
+            return data
+
+    api_url = API_URL_TEMPLATE.format(league_id, category_id)
+    if http is None:
+        http = _get_session()
+    is_full = True
+    if ijson is not None and not need_full:
+        # Stream-decode: the parser never holds the raw body and the
+        # decoded tree in memory at the same time. The raw-dump path
+        # still needs the whole document, so it stays buffered.
+        response = http.get(api_url, timeout=30, stream=True)
+        try:
+            response.raise_for_status()
+            data = _stream_feed(_ResponseReader(response))
+            is_full = False
+        finally:
+            response.close()
+    else:
+        # Buffered decode (raw dump requested or ijson missing), but
+        # still streamed into a single preallocated buffer.
+        response = http.get(api_url, timeout=30, stream=True)
+        try:
+            response.raise_for_status()
+            data = _loads(_read_body(response))
+        finally:
+            response.close()
+
+    if len(_FEED_CACHE) >= _FEED_CACHE_MAX:
+        del _FEED_CACHE[min(_FEED_CACHE, key=lambda k: _FEED_CACHE[k][0])]
+    _FEED_CACHE[key] = (now, data, is_full)
+    return data
+
 # --- ENHANCED SCRAPER WITH DYNAMIC PARSING ---
-def scrape_and_parse_draftkings(log_queue: queue.Queue, league_id: str, category_id: str, 
-                                subcategory_id: str, save_raw: bool = False) -> Tuple[pd.DataFrame, str, Dict]:
+def scrape_and_parse_draftkings(log_queue: queue.Queue, league_id: str, category_id: str,
+                                subcategory_id: str, save_raw: bool = False,
+                                http: Optional[cffi_requests.Session] = None) -> Tuple[pd.DataFrame, str, Dict]:
     """Enhanced scraper with dynamic structure analysis"""
     log_queue.put(f"Scraping DraftKings API...")
     log_queue.put(f"  League ID: {league_id}, Category ID: {category_id}, Sub-Category ID: {subcategory_id or 'None'}")
-    
-    api_url = f"https://sportsbook-nash.draftkings.com/api/sportscontent/dkusoh/v1/leagues/{league_id}/categories/{category_id}"
-    
+
     try:
-        response = cffi_requests.get(api_url, impersonate="chrome110", timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = _fetch_feed(league_id, category_id, http=http, need_full=save_raw)
         log_queue.put("  Successfully fetched data feed.")
-        
-        # Save raw data if requested
+
+        return parse_draftkings_feed(data, log_queue, category_id, subcategory_id, save_raw)
+
+    except Exception as e:
+        log_queue.put(f"ERROR: An error occurred.\nDetails: {e}")
+        import traceback
+        log_queue.put(f"Traceback: {traceback.format_exc()}")
+        return pd.DataFrame(), "unknown", {}
+
+def _dump_raw(data: Dict[str, Any], category_id: str, subcategory_id: str,
+              log_queue: queue.Queue) -> None:
+    """Write the raw feed to disk; orjson pretty-serializes large feeds an
+    order of magnitude faster than stdlib json.dump."""
+    raw_path = f"raw_data_{category_id}_{subcategory_id or 'all'}.json"
+    try:
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2).encode('utf-8')
+        with open(raw_path, 'wb') as f:
+            f.write(payload)
+        log_queue.put(f"  Saved raw data to file.")
+    except Exception as e:
+        log_queue.put(f"  WARNING: Could not save raw data: {e}")
+
+def parse_draftkings_feed(data: Dict[str, Any], log_queue: queue.Queue, category_id: str,
+                          subcategory_id: str, save_raw: bool = False) -> Tuple[pd.DataFrame, str, Dict]:
+    """Analyze and parse an already-decoded category feed into a DataFrame."""
+    try:
+        # Save raw data if requested; the multi-MB dump runs on its own
+        # thread so structure analysis doesn't wait on disk.
         if save_raw:
-            with open(f"raw_data_{category_id}_{subcategory_id or 'all'}.json", 'w') as f:
-                json.dump(data, f, indent=2)
-            log_queue.put(f"  Saved raw data to file.")
-        
-        # Analyze structure
-        analyzer = StructureAnalyzer(data, log_queue)
-        analysis = analyzer.analyze_structure()
+            threading.Thread(target=_dump_raw,
+                             args=(data, category_id, subcategory_id, log_queue),
+                             daemon=True).start()
         
         # Extract all data structures
         all_markets = data.get('markets', [])
         all_selections = data.get('selections', [])
         all_events = data.get('events', [])
-        
+
+        analyzer = StructureAnalyzer(data, log_queue)
+
         if not all_markets:
             log_queue.put("  No markets found in response.")
-            return pd.DataFrame(), "unknown", analysis
-        
-        # Create mappings for enrichment
-        markets_info = {market['id']: market for market in all_markets}
-        events_info = {event['id']: event for event in all_events}
-        
-        # Create market to event mapping
+            return pd.DataFrame(), "unknown", analyzer.analyze_structure()
+
+        # Common for pre-season or unknown category IDs: nothing to parse, so
+        # skip building the market mappings entirely.
+        if not all_selections:
+            log_queue.put("  NOTE: No selections in feed.")
+            return (pd.DataFrame(columns=['Subject', 'Proposition', 'Odds', 'Bet', 'Line']),
+                    "unknown", analyzer.analyze_structure())
+
+        # Build every market-derived mapping in a single pass: the id lookup,
+        # the market->event link, and the subcategory-filtered id set.
+        markets_info = {}
         market_to_event = {}
-        for market in all_markets:
-            if 'eventId' in market:
-                market_to_event[market['id']] = market['eventId']
-        
-        # Filter markets by subcategory if provided
+        # Accept the id as string or int up front rather than str()-ing every
+        # market's subcategoryId inside the loop.
         if subcategory_id:
-            filtered_markets = [m for m in all_markets if str(m.get('subcategoryId')) == subcategory_id]
+            want_subs = {subcategory_id}
+            try:
+                want_subs.add(int(subcategory_id))
+            except ValueError:
+                pass
+            filtered_market_ids = set()
+            for market in all_markets:
+                market_id = market['id']
+                markets_info[market_id] = market
+                event_id = market.get('eventId')
+                if event_id is not None:
+                    market_to_event[market_id] = event_id
+                if market.get('subcategoryId') in want_subs:
+                    filtered_market_ids.add(market_id)
         else:
-            filtered_markets = all_markets
-            
-        filtered_market_ids = {m['id'] for m in filtered_markets}
-        
-        # Filter selections by market IDs
-        filtered_selections = [sel for sel in all_selections if sel.get('marketId') in filtered_market_ids]
-        
+            for market in all_markets:
+                market_id = market['id']
+                markets_info[market_id] = market
+                event_id = market.get('eventId')
+                if event_id is not None:
+                    market_to_event[market_id] = event_id
+            # No filter means every market passes; the dict's own key view
+            # gives O(1) membership without materializing a second set.
+            filtered_market_ids = markets_info.keys()
+
+        events_info = {event['id']: event for event in all_events}
+
+        # The structure analysis walks every selection anyway, so it collects
+        # the subcategory-filtered selections during the same pass.
+        analysis = analyzer.analyze_structure(filtered_market_ids)
+        filtered_selections = analyzer.filtered_selections
+
         if not filtered_selections:
             log_queue.put("  No selections found for the specified criteria.")
             return pd.DataFrame(), "unknown", analysis
@@ -357,21 +702,68 @@ def scrape_and_parse_draftkings(log_queue: queue.Queue, league_id: str, category
         
         # Create enhanced parser with event data
         parser = EnhancedDynamicParser(analysis, markets_info, events_info, market_to_event)
+
+        # Plain over/under feeds have no per-row special cases, so the whole
+        # parse collapses to column-wise operations; subject extraction runs
+        # once per unique market name instead of once per selection.
+        if market_type == "over_under":
+            sel_df = pd.DataFrame(filtered_selections, columns=['marketId', 'label', 'points', 'displayOdds'])
+            name_map = {mid: market.get('name', 'Unknown Market') for mid, market in markets_info.items()}
+            names = sel_df['marketId'].map(name_map).fillna('Unknown Market')
+            subject_map = {name: parser._extract_subject_from_market(name) for name in names.unique()}
+
+            odds_col = sel_df['displayOdds'].str.get('american').fillna('')
+            odds_col = odds_col.str.replace('−', '-', regex=False)
+            odds_col = odds_col.where(odds_col != '', 'N/A')
+
+            labels = sel_df['label'].fillna('')
+            is_ou = labels.isin(('Over', 'Under')) & sel_df['points'].notna()
+            props_col = np.where(is_ou, labels + ' ' + sel_df['points'].astype(str), names)
+            subjects_col = np.where(is_ou, names.map(subject_map), labels)
+
+            log_queue.put(f"  Parsed {len(sel_df)} betting selections.")
+            df = pd.DataFrame({'Subject': subjects_col, 'Proposition': props_col, 'Odds': odds_col,
+                               'Bet': labels.where(is_ou), 'Line': sel_df['points'].where(is_ou)},
+                              copy=False)
+            df['Subject'] = df['Subject'].astype('category')
+            df['Bet'] = df['Bet'].astype('category')
+            return df, market_type, analysis
+
+        # Accumulate fixed-arity row tuples; from_records with an explicit
+        # column list skips pandas' per-row key unification entirely.
         results = []
-        
+
+        # Bind method lookups to locals once; each iteration otherwise pays a
+        # LOAD_ATTR for every .get/.append across thousands of selections.
+        markets_get = markets_info.get
+        parse = parser.parse_selection
+        add_result = results.append
+
         for sel in filtered_selections:
-            market_id = sel.get('marketId')
-            market = markets_info.get(market_id, {})
-            market_name = market.get('name', 'Unknown Market')
-            parsed = parser.parse_selection(sel, market, market_type)
-            results.append(parsed)
-        
+            add_result(parse(sel, markets_get(sel.get('marketId'), _EMPTY), market_type))
+
         if not results:
             log_queue.put("  No valid betting selections parsed.")
             return pd.DataFrame(), market_type, analysis
-            
+
+        # The parser already knows per row whether it took an Over/Under
+        # branch, so the dispatcher never has to re-scan the frame: if every
+        # selection parsed as an Over/Under pair, honor that over the
+        # detector's generic fallback so the pivot path applies.
+        if market_type == "standard_futures" and all(row[3] is not None for row in results):
+            log_queue.put("  All selections parsed as Over/Under; using pivot formatting.")
+            market_type = "over_under"
+
         log_queue.put(f"  Parsed {len(results)} betting selections.")
-        return pd.DataFrame(results), market_type, analysis
+        df = pd.DataFrame.from_records(results, columns=['Subject', 'Proposition', 'Odds', 'Bet', 'Line'])
+        # Subject and Bet take few distinct values per feed; dictionary
+        # encoding shrinks the frame and speeds downstream grouping.
+        df['Subject'] = df['Subject'].astype('category')
+        df['Bet'] = df['Bet'].astype('category')
+        # One vectorized pass replaces the unicode minus sign (U+2212) that
+        # DraftKings uses in american odds.
+        df['Odds'] = df['Odds'].str.replace('−', '-', regex=False)
+        return df, market_type, analysis
         
     except Exception as e:
         log_queue.put(f"ERROR: An error occurred.\nDetails: {e}")
@@ -379,38 +771,79 @@ def scrape_and_parse_draftkings(log_queue: queue.Queue, league_id: str, category
         log_queue.put(f"Traceback: {traceback.format_exc()}")
         return pd.DataFrame(), "unknown", {}
 
+def scrape_all_categories(log_queue: queue.Queue, league_id: str,
+                          reference_data: List[Dict]) -> List[Tuple[str, pd.DataFrame, str, Dict]]:
+    """Fetch every category from the reference list concurrently and parse each feed.
+
+    Uses a single AsyncSession so all requests share one curl multi loop; total
+    wall time is bound by server round-trip, not by the number of categories.
+    """
+    category_ids = []
+    for category in reference_data:
+        match = _ID_RE.search(category.get('category_name', ''))
+        if match:
+            category_ids.append(match.group(1))
+
+    if not category_ids:
+        log_queue.put("ERROR: No category IDs found in reference data.")
+        return []
+
+    urls = [API_URL_TEMPLATE.format(league_id, cid) for cid in category_ids]
+    log_queue.put(f"Batch scraping {len(urls)} categories...")
+
+    async def _fetch_all():
+        async with AsyncSession(impersonate="chrome110") as session:
+            tasks = [session.get(url, timeout=30) for url in urls]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+    responses = asyncio.run(_fetch_all())
+
+    results = []
+    for category_id, response in zip(category_ids, responses):
+        if isinstance(response, Exception):
+            log_queue.put(f"  Category {category_id} failed: {response}")
+            continue
+        try:
+            response.raise_for_status()
+            data = _loads(response.content)
+        except Exception as e:
+            log_queue.put(f"  Category {category_id} failed: {e}")
+            continue
+        log_queue.put(f"\n--- Category {category_id} ---")
+        df, market_type, analysis = parse_draftkings_feed(data, log_queue, category_id, "")
+        results.append((category_id, df, market_type, analysis))
+    return results
+
 def _detect_market_type_from_analysis(analysis: Dict[str, Any], category_id: str) -> str:
     """Detect market type from structure analysis"""
+    # Category-based detection is authoritative, so answer from the known IDs
+    # before paying for any ratio math over the label counts.
+    if category_id == "1759":
+        return "player_props"
+    elif category_id == "1801":
+        return "threshold"  # Rookie props are threshold type
+    elif category_id == "820":
+        return "division_standings"
+
     patterns = analysis.get('patterns', {})
     label_counts = patterns.get('label_patterns', {})
-    
+
     # Check label patterns
     total_labels = sum(label_counts.values())
     if total_labels > 0:
         over_under_ratio = (label_counts.get('Over', 0) + label_counts.get('Under', 0)) / total_labels
         if over_under_ratio > 0.8:
-            # Check if it's player props based on category
-            if category_id == "1759":
-                return "player_props"
             return "over_under"
-        
+
         ordinal_ratio = sum(label_counts.get(ord, 0) for ord in ['1st', '2nd', '3rd', '4th']) / total_labels
         if ordinal_ratio > 0.8:
             return "division_standings"
-        
+
         # Check for threshold pattern
         threshold_count = sum(1 for label in label_counts if label.endswith('+'))
         if threshold_count > total_labels * 0.5:
             return "threshold"
-    
-    # Category-based detection
-    if category_id == "1759":
-        return "player_props"
-    elif category_id == "1801":
-        return "threshold"  # Rookie props are threshold type
-    elif category_id == "820":
-        return "division_standings"
-    
+
     return "standard_futures"
 
 # --- SMART PIVOT HANDLER ---
@@ -424,67 +857,116 @@ def apply_smart_formatting(df: pd.DataFrame, market_type: str, analysis: Dict) -
         return df
 
     if market_type == "over_under":
-        # 1. Extract bet type (Over/Under) and the betting line from the 'Proposition' column.
-        # The regex is improved to handle potential positive/negative signs in the line value.
-        extracted_data = df['Proposition'].str.extract(r'(Over|Under)\s+([+-]?[\d.]+)', expand=True)
-        df['Bet'] = extracted_data[0]
-        df['Line'] = extracted_data[1]
-
-        # Drop any rows where the extraction did not find a valid bet/line.
-        df.dropna(subset=['Bet', 'Line'], inplace=True)
-        if df.empty:
-            return pd.DataFrame()
-
-        # 2. Convert 'Line' and 'Odds' columns to numeric types for calculation.
-        # Handles unicode minus signs and converts odds to numbers.
-        df['Line'] = pd.to_numeric(df['Line'])
-        df['Odds'] = pd.to_numeric(df['Odds'].astype(str).str.replace('−', '-'))
-
-        # 3. Pivot the data to create pairs of Over/Under odds for each unique line for each team.
-        # This gives us all available betting options for each participant.
-        line_options = df.pivot_table(
-            index=['Subject', 'Line'],
-            columns='Bet',
-            values='Odds',
-            aggfunc='first'  # 'first' is safe here as there's one odd per selection
-        ).reset_index()
-
-        # Rename columns for clarity and drop lines that don't have both Over and Under odds.
-        line_options.rename(columns={'Over': 'Over Odds', 'Under': 'Under Odds'}, inplace=True)
-        line_options.dropna(subset=['Over Odds', 'Under Odds'], inplace=True)
-
-        if line_options.empty:
-            return pd.DataFrame() # Return empty if no valid pairs were found
-
-        # 4. Calculate a 'cost' for each line. The main line typically has odds closest
-        # to -110, meaning the sum of their absolute values will be the smallest.
-        line_options['cost'] = line_options['Over Odds'].abs() + line_options['Under Odds'].abs()
-
-        # 5. For each team ('Subject'), find the line with the minimum cost.
-        # This effectively selects the main betting line.
-        idx = line_options.groupby('Subject')['cost'].idxmin()
-        main_lines = line_options.loc[idx]
-
-        # 6. Format the final DataFrame for display.
-        main_lines = main_lines.rename(columns={'Subject': 'Participant'})
-        final_cols = ['Participant', 'Line', 'Over Odds', 'Under Odds']
-        
-        # Ensure data types are correct for the final output
-        main_lines['Over Odds'] = main_lines['Over Odds'].astype(int)
-        main_lines['Under Odds'] = main_lines['Under Odds'].astype(int)
-
-        return main_lines[final_cols].reset_index(drop=True)
+        # 1. Produce (subject, bet, line, odds) tuples. When Bet/Line were
+        # emitted at parse time they are used directly; legacy frames fall
+        # back to matching the Proposition string per row.
+        if 'Bet' in df.columns and 'Line' in df.columns:
+            rows = zip(df['Subject'], df['Bet'], df['Line'], df['Odds'])
+        else:
+            # Cheap head-sample guard: over/under feeds are homogeneous, so if
+            # the first few propositions don't look like "Over N"/"Under N"
+            # the type detector misfired and scanning the whole frame would be
+            # wasted work on data we'd end up discarding anyway.
+            head = df['Proposition'].head(8)
+            if not head.map(lambda s: isinstance(s, str) and s.startswith(('Over ', 'Under '))).all():
+                return df
+
+            # "Over 10.5" splits on the first space; a partition plus a
+            # two-way membership test replaces the per-row regex search.
+            def _extracted():
+                for subject, prop, odds in zip(df['Subject'], df['Proposition'], df['Odds']):
+                    if isinstance(prop, str):
+                        bet, _, line = prop.partition(' ')
+                        if line and bet in ('Over', 'Under'):
+                            yield subject, bet, line, odds
+            rows = _extracted()
+
+        # 2. Single-pass groupby: collect the first Over and Under odds seen
+        # for each (subject, line) pair. A plain dict does in one walk what
+        # the old pivot_table/merge pipeline spread over several pandas ops.
+        pairs: Dict[Tuple, List] = {}
+        for subject, bet, line, odds in rows:
+            if bet == 'Over':
+                slot_idx = 0
+            elif bet == 'Under':
+                slot_idx = 1
+            else:
+                continue
+            try:
+                line_val = float(line)
+                odds_val = int(str(odds).replace('−', '-'))
+            except (TypeError, ValueError):
+                continue
+            if line_val != line_val:  # NaN line from a non-OU row
+                continue
+            slot = pairs.setdefault((subject, line_val), [None, None])
+            if slot[slot_idx] is None:  # keep the first odd per line, as before
+                slot[slot_idx] = odds_val
+
+        # 3. For each subject keep the line whose odds sum is closest to even
+        # money (the main line); lines missing either side are skipped.
+        best: Dict[str, Tuple] = {}
+        for (subject, line_val), (over_odds, under_odds) in pairs.items():
+            if over_odds is None or under_odds is None:
+                continue
+            cost = abs(over_odds) + abs(under_odds)
+            current = best.get(subject)
+            if current is None or cost < current[0]:
+                best[subject] = (cost, line_val, over_odds, under_odds)
+
+        if not best:
+            return pd.DataFrame()  # Return empty if no valid pairs were found
+
+        records = [(subject, line_val, over_odds, under_odds)
+                   for subject, (_, line_val, over_odds, under_odds) in sorted(best.items())]
+        return pd.DataFrame.from_records(records, columns=['Participant', 'Line', 'Over Odds', 'Under Odds'])
 
     # Return the original dataframe if the market type is not 'over_under'.
     return df
 
+def _format_table(columns: List[str], rows: List[Tuple]) -> str:
+    """Render rows as aligned plain text for the log.
+
+    DataFrame.to_string formats every cell through pandas' repr machinery;
+    for log display a straight str() per cell with column padding is an
+    order of magnitude cheaper on large results.
+    """
+    cells = [[str(c) for c in columns]]
+    cells.extend([('' if v is None else str(v)) for v in row] for row in rows)
+    widths = [max(len(row[i]) for row in cells) for i in range(len(columns))]
+    return "\n".join("  ".join(row[i].ljust(widths[i]) for i in range(len(row))).rstrip()
+                     for row in cells)
+
 # --- GUI APPLICATION WITH ENHANCED FEATURES ---
+class _UILogQueue(queue.Queue):
+    """Log queue whose put() nudges the Tk event loop.
+
+    Worker threads push messages as usual; each put fires a virtual event
+    (thread-safe in Tk 8.6+) so the GUI drains on demand with sub-ms latency
+    instead of waking on a polling timer while idle.
+    """
+
+    def __init__(self, root):
+        super().__init__()
+        self._root = root
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        try:
+            self._root.event_generate('<<LogAvailable>>', when='tail')
+        except tk.TclError:
+            pass  # window is being torn down
+
 class ScraperApp:
     def __init__(self, root):
         self.root = root
         self.root.title("DraftKings API Scraper - Dynamic Parser")
         self.root.geometry("950x700")
-        
+
+        # Persistent session so repeated scrapes reuse the same TCP/TLS connection
+        self.http = cffi_requests.Session(impersonate="chrome110")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         menubar = Menu(root)
         root.config(menu=menubar)
         
@@ -510,9 +992,12 @@ class ScraperApp:
         self.notebook.add(self.reference_tab, text='ID Reference')
         self.setup_reference_tab()
         
-        self.log_queue = queue.Queue()
+        self.log_queue = _UILogQueue(root)
+        self.root.bind('<<LogAvailable>>', self._drain_log)
         self.last_analysis = {}
-        self.root.after(100, self.process_queue)
+        self._last_raw_bytes = None
+        self._parse_pool = None  # spawned on first analysis decode
+        self._analysis_window = None  # reused across View Structure Analysis
 
     def setup_scraper_tab(self):
         input_frame = tk.Frame(self.scraper_tab, padx=10, pady=10)
@@ -543,7 +1028,11 @@ class ScraperApp:
                                       width=15, bg="#4CAF50", fg="white", font=("Helvetica", 10, "bold"))
         self.scrape_button.pack(pady=2, fill=tk.X)
         
-        self.analyze_button = tk.Button(button_frame, text="Analyze Only", command=self.analyze_structure_only, 
+        self.grab_all_button = tk.Button(button_frame, text="Grab All", command=self.start_batch_scraping_thread,
+                                        width=15, bg="#9C27B0", fg="white")
+        self.grab_all_button.pack(pady=2, fill=tk.X)
+
+        self.analyze_button = tk.Button(button_frame, text="Analyze Only", command=self.analyze_structure_only,
                                        width=15, bg="#2196F3", fg="white")
         self.analyze_button.pack(pady=2, fill=tk.X)
         
@@ -562,7 +1051,10 @@ class ScraperApp:
         log_frame = tk.Frame(self.scraper_tab, padx=10, pady=5)
         log_frame.pack(fill=tk.BOTH, expand=True)
         
-        self.log_widget = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, state=tk.DISABLED, font=("Courier New", 9))
+        # undo=False: the log is append-only, so skip the per-insert undo
+        # bookkeeping Tk would otherwise keep for the whole session.
+        self.log_widget = scrolledtext.ScrolledText(log_frame, wrap=tk.WORD, state=tk.DISABLED,
+                                                    font=("Courier New", 9), undo=False)
         self.log_widget.pack(fill=tk.BOTH, expand=True)
 
     def setup_reference_tab(self):
@@ -574,60 +1066,39 @@ class ScraperApp:
         
         self.ref_text_widget.tag_config("clickable", foreground="blue", underline=True)
         self.ref_text_widget.tag_config("category", font=("Courier New", 11, "bold"))
-        self.ref_text_widget.insert(tk.END, "DRAFTKINGS API CATEGORY REFERENCE\n", "category")
-        self.ref_text_widget.insert(tk.END, "="*50 + "\n")
-        self.ref_text_widget.insert(tk.END, "League ID for NFL: 88808\n", "category")
-        self.ref_text_widget.insert(tk.END, "-"*50 + "\n")
-        self.ref_text_widget.insert(tk.END, "Click any blue ID to auto-fill it on the Scraper tab.\n\n")
-        
-        reference_data = load_and_format_reference_data()
-        for category in reference_data:
-            cat_name = category['category_name']
-            self.ref_text_widget.insert(tk.END, f"{cat_name}\n", "category")
-            
-            cat_id_match = re.search(r'ID: (\d+)', cat_name)
-            if cat_id_match:
-                cat_id = cat_id_match.group(1)
-                tag_name = f"cat-{cat_id}"
-                start_index = self.ref_text_widget.search(cat_id, "end-2l", "end")
-                if start_index:
-                    self.ref_text_widget.tag_add(tag_name, start_index, f"{start_index}+{len(cat_id)}c")
-                    self.ref_text_widget.tag_add("clickable", start_index, f"{start_index}+{len(cat_id)}c")
-                    self.ref_text_widget.tag_bind(tag_name, "<Button-1>", self.on_reference_click)
-            
-            for sub in category['subcategories']:
-                self.ref_text_widget.insert(tk.END, f"  • {sub}\n")
-                sub_id_match = re.search(r'ID: (\d+)', sub)
-                if sub_id_match and cat_id_match:
-                    sub_id = sub_id_match.group(1)
-                    tag_name = f"sub-{sub_id}-parent-{cat_id}"
-                    start_index = self.ref_text_widget.search(sub_id, "end-2l", "end")
-                    if start_index:
-                        self.ref_text_widget.tag_add(tag_name, start_index, f"{start_index}+{len(sub_id)}c")
-                        self.ref_text_widget.tag_add("clickable", start_index, f"{start_index}+{len(sub_id)}c")
-                        self.ref_text_widget.tag_bind(tag_name, "<Button-1>", self.on_reference_click)
-            
-            self.ref_text_widget.insert(tk.END, "\n")
-        
+
+        # The render (one big string plus precomputed tag positions) is built
+        # once and cached on disk, so warm starts go straight to a single
+        # insert and batched tag_add calls.
+        text, tag_spans, self._ref_line_targets = load_reference_render()
+
+        self.ref_text_widget.insert(tk.END, text)
+        # tag_add accepts any number of start/end pairs, so one Tcl call per
+        # tag covers every span instead of one call per span.
+        ranges_by_tag = defaultdict(list)
+        for tag, start, end in tag_spans:
+            ranges_by_tag[tag].extend((start, end))
+        for tag, ranges in ranges_by_tag.items():
+            self.ref_text_widget.tag_add(tag, *ranges)
+        self.ref_text_widget.tag_bind("clickable", "<Button-1>", self.on_reference_click)
+
         self.ref_text_widget.config(state=tk.DISABLED)
 
     def on_reference_click(self, event):
         index = self.ref_text_widget.index(f"@{event.x},{event.y}")
-        tags = self.ref_text_widget.tag_names(index)
-        
-        for tag in tags:
-            if tag.startswith("cat-"):
-                self.category_id_var.set(tag.split('-')[1])
+        row = int(index.split('.')[0])
+
+        target = self._ref_line_targets.get(row)
+        if target:
+            cat_id, sub_id = target
+            self.category_id_var.set(cat_id)
+            if sub_id:
+                self.subcategory_id_var.set(sub_id)
+                self.status_label.config(text="Category and Sub-Category IDs set", fg="blue")
+            else:
                 self.subcategory_id_var.set("")
                 self.status_label.config(text="Category ID set", fg="blue")
-                break
-            elif tag.startswith("sub-"):
-                parts = tag.split('-')
-                self.category_id_var.set(parts[3])
-                self.subcategory_id_var.set(parts[1])
-                self.status_label.config(text="Category and Sub-Category IDs set", fg="blue")
-                break
-        
+
         self.notebook.select(self.scraper_tab)
 
     def log_message(self, msg):
@@ -636,22 +1107,33 @@ class ScraperApp:
         self.log_widget.config(state=tk.DISABLED)
         self.log_widget.see(tk.END)
 
-    def process_queue(self):
+    def _drain_log(self, event=None):
+        """Drain every pending log message; fired by <<LogAvailable>>.
+
+        Bursty puts coalesce naturally: the first event empties the queue
+        and the trailing events find nothing to do.
+        """
+        msgs = []
         try:
             while True:
-                self.log_message(self.log_queue.get_nowait())
+                msgs.append(self.log_queue.get_nowait())
         except queue.Empty:
             pass
-        finally:
-            self.root.after(100, self.process_queue)
+
+        if msgs:
+            # One state toggle and one insert per drain, however many
+            # messages arrived, instead of a widget update per message.
+            self.log_widget.config(state=tk.NORMAL)
+            self.log_widget.insert(tk.END, '\n'.join(msgs) + '\n')
+            self.log_widget.config(state=tk.DISABLED)
+            self.log_widget.see(tk.END)
 
     def start_scraping_thread(self):
         self.scrape_button.config(state=tk.DISABLED, bg="#FFA500")
         self.save_button.config(state=tk.DISABLED)
         self.status_label.config(text="Scraping in progress...", fg="orange")
         
-        self.log_message("\n" + "="*50)
-        self.log_message("--- New Scraping Request ---")
+        self.log_message("\n" + "="*50 + "\n--- New Scraping Request ---")
         self.scraped_df = None
         
         league_id = self.league_id_var.get().strip()
@@ -671,7 +1153,7 @@ class ScraperApp:
 
     def run_scraping_logic(self, league_id, category_id, subcategory_id, save_raw):
         raw_df, market_type, analysis = scrape_and_parse_draftkings(
-            self.log_queue, league_id, category_id, subcategory_id, save_raw
+            self.log_queue, league_id, category_id, subcategory_id, save_raw, http=self.http
         )
         
         self.last_analysis = analysis
@@ -695,13 +1177,63 @@ class ScraperApp:
         self.log_queue.put("\n--- Scraping Complete ---")
         self.log_queue.put(f"Market Type: {market_type}")
         self.log_queue.put(f"Total Rows: {len(self.scraped_df)}")
-        self.log_queue.put(f"\n{self.scraped_df.to_string()}")
+        table = _format_table(list(self.scraped_df.columns),
+                              list(self.scraped_df.itertuples(index=False, name=None)))
+        self.log_queue.put(f"\n{table}")
         self.log_queue.put("="*50 + "\n")
         
         self.scrape_button.config(state=tk.NORMAL, bg="#4CAF50")
         self.save_button.config(state=tk.NORMAL)
         self.status_label.config(text=f"Success! {len(self.scraped_df)} rows retrieved ({market_type})", fg="green")
 
+    def start_batch_scraping_thread(self):
+        league_id = self.league_id_var.get().strip()
+        if not league_id:
+            self.log_message("ERROR: League ID cannot be empty.")
+            self.status_label.config(text="Error: Missing League ID", fg="red")
+            return
+
+        self.scrape_button.config(state=tk.DISABLED)
+        self.grab_all_button.config(state=tk.DISABLED, bg="#FFA500")
+        self.save_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Batch scraping in progress...", fg="orange")
+
+        self.log_message("\n" + "="*50 + "\n--- New Batch Scraping Request (all categories) ---")
+        self.scraped_df = None
+
+        threading.Thread(target=self.run_batch_scraping_logic, args=(league_id,), daemon=True).start()
+
+    def run_batch_scraping_logic(self, league_id):
+        reference_data = load_and_format_reference_data()
+        results = scrape_all_categories(self.log_queue, league_id, reference_data)
+
+        frames = []
+        for category_id, raw_df, market_type, analysis in results:
+            if raw_df.empty:
+                continue
+            formatted = apply_smart_formatting(raw_df, market_type, analysis)
+            if formatted.empty:
+                continue
+            formatted.insert(0, 'Category ID', category_id)
+            frames.append(formatted)
+
+        self.scrape_button.config(state=tk.NORMAL)
+        self.grab_all_button.config(state=tk.NORMAL, bg="#9C27B0")
+
+        if not frames:
+            self.log_queue.put("Batch scraping finished with no results.")
+            self.status_label.config(text="No data found", fg="red")
+            return
+
+        self.scraped_df = pd.concat(frames, ignore_index=True)
+        self.log_queue.put("\n--- Batch Scraping Complete ---")
+        self.log_queue.put(f"Categories with data: {len(frames)}")
+        self.log_queue.put(f"Total Rows: {len(self.scraped_df)}")
+        self.log_queue.put("="*50 + "\n")
+
+        self.save_button.config(state=tk.NORMAL)
+        self.status_label.config(text=f"Success! {len(self.scraped_df)} rows from {len(frames)} categories", fg="green")
+
     def analyze_structure_only(self):
         """Run structure analysis without full parsing"""
         league_id = self.league_id_var.get().strip()
@@ -718,35 +1250,45 @@ class ScraperApp:
     
     def _run_analysis_only(self, league_id, category_id):
         """Thread function for structure analysis"""
-        api_url = f"https://sportsbook-nash.draftkings.com/api/sportscontent/dkusoh/v1/leagues/{league_id}/categories/{category_id}"
-        
+        api_url = API_URL_TEMPLATE.format(league_id, category_id)
+
         try:
-            response = cffi_requests.get(api_url, impersonate="chrome110", timeout=30)
+            response = self.http.get(api_url, timeout=30)
             response.raise_for_status()
-            data = response.json()
+            # Keep the raw bytes so "Export Raw Data" can write them straight
+            # to disk without another fetch or a re-serialize.
+            self._last_raw_bytes = response.content
+            # Decode in a single-worker subprocess: the CPU-bound JSON parse
+            # of a multi-MB payload then can't contend with the Tk mainloop
+            # for the GIL. Falls back to decoding in this thread.
+            try:
+                if self._parse_pool is None:
+                    self._parse_pool = ProcessPoolExecutor(max_workers=1)
+                data = self._parse_pool.submit(_loads, self._last_raw_bytes).result()
+            except Exception:
+                data = _loads(self._last_raw_bytes)
             
             analyzer = StructureAnalyzer(data, self.log_queue)
             analysis = analyzer.analyze_structure()
             self.last_analysis = analysis
             
             # Display detailed analysis
-            self.log_queue.put("\n--- Detailed Structure Report ---")
-            self.log_queue.put(f"Total markets: {len(data.get('markets', []))}")
-            self.log_queue.put(f"Total selections: {len(data.get('selections', []))}")
+            self.log_queue.put("\n--- Detailed Structure Report ---\n"
+                               f"Total markets: {len(data.get('markets', []))}\n"
+                               f"Total selections: {len(data.get('selections', []))}")
             
-            # Show sample selection with all fields
+            # Show sample selection/market with all fields; each sample goes
+            # through the queue as one pre-joined message rather than a put
+            # (and a widget wake-up) per field.
             if data.get('selections'):
-                self.log_queue.put("\nSample Selection (first item):")
                 sample = data['selections'][0]
-                for key, value in sample.items():
-                    self.log_queue.put(f"  {key}: {value}")
-            
-            # Show sample market with all fields
+                self.log_queue.put("\nSample Selection (first item):\n" +
+                                   "\n".join("  %s: %s" % kv for kv in sample.items()))
+
             if data.get('markets'):
-                self.log_queue.put("\nSample Market (first item):")
                 sample = data['markets'][0]
-                for key, value in sample.items():
-                    self.log_queue.put(f"  {key}: {value}")
+                self.log_queue.put("\nSample Market (first item):\n" +
+                                   "\n".join("  %s: %s" % kv for kv in sample.items()))
             
             self.log_queue.put("\nAnalysis complete. Use 'View Structure Analysis' menu for full details.")
             
@@ -759,78 +1301,130 @@ class ScraperApp:
             messagebox.showinfo("No Analysis", "No structure analysis available. Run a scrape or analysis first.")
             return
         
-        # Create new window
-        analysis_window = tk.Toplevel(self.root)
-        analysis_window.title("Structure Analysis Details")
-        analysis_window.geometry("600x500")
-        
-        # Create text widget with scrollbar
-        text_frame = tk.Frame(analysis_window)
-        text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        text_widget = scrolledtext.ScrolledText(text_frame, wrap=tk.WORD, font=("Courier New", 10))
-        text_widget.pack(fill=tk.BOTH, expand=True)
-        
-        # Display analysis
-        text_widget.insert(tk.END, "=== API STRUCTURE ANALYSIS ===\n\n")
-        
+        # Reuse the window between invocations; rebuilding the Toplevel,
+        # frame, text widget and button is all Tcl round-trips for an
+        # identical layout.
+        if self._analysis_window is not None and self._analysis_window.winfo_exists():
+            text_widget = self._analysis_text
+            self._analysis_window.lift()
+        else:
+            analysis_window = tk.Toplevel(self.root)
+            analysis_window.title("Structure Analysis Details")
+            analysis_window.geometry("600x500")
+
+            # Create text widget with scrollbar
+            text_frame = tk.Frame(analysis_window)
+            text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+            # Created read-only; the populate step below enables it exactly
+            # once around the single bulk insert.
+            text_widget = scrolledtext.ScrolledText(text_frame, wrap=tk.WORD,
+                                                    font=("Courier New", 10), state=tk.DISABLED)
+            text_widget.pack(fill=tk.BOTH, expand=True)
+
+            # Add close button
+            close_button = tk.Button(analysis_window, text="Close", command=analysis_window.destroy)
+            close_button.pack(pady=10)
+
+            self._analysis_window = analysis_window
+            self._analysis_text = text_widget
+
+        # Build the whole report as one string so the widget is touched by a
+        # single insert instead of dozens of Tcl round-trips.
+        parts = ["=== API STRUCTURE ANALYSIS ===\n\n"]
+
         # Market fields
         if 'market_fields' in self.last_analysis:
             fields_info = self.last_analysis['market_fields']
-            text_widget.insert(tk.END, "MARKET FIELDS:\n")
-            text_widget.insert(tk.END, f"Fields: {', '.join(fields_info.get('common_fields', []))}\n\n")
-            
-            text_widget.insert(tk.END, "Sample values:\n")
+            parts.append("MARKET FIELDS:\n")
+            parts.append(f"Fields: {', '.join(fields_info.get('common_fields', []))}\n\n")
+
+            parts.append("Sample values:\n")
             for field, samples in fields_info.get('sample_values', {}).items():
-                text_widget.insert(tk.END, f"  {field}: {samples[0] if samples else 'N/A'}\n")
-            text_widget.insert(tk.END, "\n")
-        
+                parts.append(f"  {field}: {samples[0] if samples else 'N/A'}\n")
+            parts.append("\n")
+
         # Selection fields
         if 'selection_fields' in self.last_analysis:
             fields_info = self.last_analysis['selection_fields']
-            text_widget.insert(tk.END, "SELECTION FIELDS:\n")
-            text_widget.insert(tk.END, f"Fields: {', '.join(fields_info.get('common_fields', []))}\n\n")
-            
-            text_widget.insert(tk.END, "Sample values:\n")
+            parts.append("SELECTION FIELDS:\n")
+            parts.append(f"Fields: {', '.join(fields_info.get('common_fields', []))}\n\n")
+
+            parts.append("Sample values:\n")
             for field, samples in fields_info.get('sample_values', {}).items():
-                text_widget.insert(tk.END, f"  {field}: {samples[:2]}\n")
-            text_widget.insert(tk.END, "\n")
-        
+                parts.append(f"  {field}: {samples[:2]}\n")
+            parts.append("\n")
+
         # Patterns
         if 'patterns' in self.last_analysis:
             patterns = self.last_analysis['patterns']
-            text_widget.insert(tk.END, "DETECTED PATTERNS:\n")
-            
+            parts.append("DETECTED PATTERNS:\n")
+
             label_patterns = patterns.get('label_patterns', {})
             if label_patterns:
-                text_widget.insert(tk.END, "Label distribution:\n")
-                for label, count in sorted(label_patterns.items(), key=lambda x: x[1], reverse=True)[:10]:
-                    text_widget.insert(tk.END, f"  {label}: {count} occurrences\n")
-            
-            text_widget.insert(tk.END, f"\nHas points field: {patterns.get('has_points', False)}\n")
-            text_widget.insert(tk.END, f"Has participant fields: {patterns.get('has_participants', False)}\n")
-        
+                if not isinstance(label_patterns, Counter):
+                    label_patterns = Counter(label_patterns)
+                parts.append("Label distribution:\n")
+                # Heap-based top-10 selection instead of fully sorting every
+                # distinct label.
+                for label, count in label_patterns.most_common(10):
+                    parts.append(f"  {label}: {count} occurrences\n")
+
+            parts.append(f"\nHas points field: {patterns.get('has_points', False)}\n")
+            parts.append(f"Has participant fields: {patterns.get('has_participants', False)}\n")
+
+        # One state toggle pair and one insert: the widget lays the report
+        # out in a single reflow instead of one per section.
+        text_widget.config(state=tk.NORMAL)
+        text_widget.delete('1.0', tk.END)
+        text_widget.insert(tk.END, "".join(parts))
         text_widget.config(state=tk.DISABLED)
-        
-        # Add close button
-        close_button = tk.Button(analysis_window, text="Close", command=analysis_window.destroy)
-        close_button.pack(pady=10)
+        text_widget.see('1.0')
 
     def export_raw_data(self):
         """Export the last raw API response"""
-        if not hasattr(self, 'scraped_df') or self.scraped_df is None:
-            messagebox.showinfo("No Data", "No data available. Run a scrape first.")
+        league_id = self.league_id_var.get().strip()
+        category_id = self.category_id_var.get().strip()
+        if not self._last_raw_bytes and not (league_id and category_id):
+            messagebox.showinfo("No Data", "No raw data available. Run a structure analysis first.")
             return
-        
+
         filepath = filedialog.asksaveasfilename(
             defaultextension=".json",
             filetypes=[("JSON files", "*.json")],
             title="Export Raw API Data"
         )
-        
-        if filepath:
-            messagebox.showinfo("Info", "Raw data export requires re-fetching. This will take a moment...")
-            # Re-run with save_raw=True would be needed here
+        if not filepath:
+            return
+
+        if self._last_raw_bytes:
+            try:
+                with open(filepath, 'wb') as f:
+                    f.write(self._last_raw_bytes)
+                self.log_message(f"Exported raw data to: {filepath}")
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not export raw data: {e}")
+        else:
+            # Nothing cached: stream the feed chunk-by-chunk straight to the
+            # file on a worker thread, never building the document in memory.
+            api_url = API_URL_TEMPLATE.format(league_id, category_id)
+            self.log_message("Fetching raw data for export...")
+            threading.Thread(target=self._export_raw_worker,
+                             args=(api_url, filepath), daemon=True).start()
+
+    def _export_raw_worker(self, api_url, filepath):
+        try:
+            response = self.http.get(api_url, timeout=30, stream=True)
+            try:
+                response.raise_for_status()
+                with open(filepath, 'wb') as f:
+                    for chunk in response.iter_content(65536):
+                        f.write(chunk)
+            finally:
+                response.close()
+            self.log_queue.put(f"Exported raw data to: {filepath}")
+        except Exception as e:
+            self.log_queue.put(f"ERROR exporting raw data: {e}")
 
     def save_results(self):
         if self.scraped_df is None or self.scraped_df.empty:
@@ -846,27 +1440,71 @@ class ScraperApp:
         if not filepath:
             self.log_message("Save operation cancelled.")
             return
-        
+
+        # Write on a worker thread so large exports don't freeze the UI;
+        # same pattern as start_scraping_thread.
+        self.save_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Saving...", fg="orange")
+        threading.Thread(target=self._save_results_worker,
+                        args=(self.scraped_df, filepath),
+                        daemon=True).start()
+
+    def _save_results_worker(self, df, filepath):
         try:
             if filepath.endswith('.xlsx'):
-                self.scraped_df.to_excel(filepath, index=False)
+                try:
+                    # xlsxwriter's constant_memory mode streams rows straight
+                    # to the zip instead of holding every cell like openpyxl;
+                    # pandas writes rows in order, which the mode requires.
+                    with pd.ExcelWriter(filepath, engine="xlsxwriter",
+                                        engine_kwargs={"options": {"constant_memory": True}}) as writer:
+                        df.to_excel(writer, index=False)
+                except ImportError:  # xlsxwriter not installed
+                    df.to_excel(filepath, index=False)
+            elif pa is not None:
+                # Arrow's CSV writer serializes column-at-a-time in C instead
+                # of formatting every cell through Python.
+                pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filepath)
             else:
-                self.scraped_df.to_csv(filepath, index=False)
-            
-            self.log_message(f"\nSuccessfully saved results to: {filepath}")
-            messagebox.showinfo("Success", f"Data saved successfully to:\n{filepath}")
+                # Plain csv.writer over row tuples skips pandas' cell
+                # formatting layer entirely.
+                with open(filepath, 'w', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(df.columns)
+                    writer.writerows(df.itertuples(index=False, name=None))
+
+            self.log_queue.put(f"\nSuccessfully saved results to: {filepath}")
             self.status_label.config(text=f"Saved to {filepath.split('/')[-1]}", fg="green")
         except Exception as e:
-            self.log_message(f"ERROR saving file: {e}")
-            messagebox.showerror("Save Error", f"An error occurred: {e}")
+            self.log_queue.put(f"ERROR saving file: {e}")
+            self.status_label.config(text="Save failed", fg="red")
+        finally:
+            self.save_button.config(state=tk.NORMAL)
     
+    def on_close(self):
+        try:
+            self.http.close()
+        except Exception:
+            pass
+        if _SESSION is not None:
+            try:
+                _SESSION.close()
+            except Exception:
+                pass
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False)
+        self.root.destroy()
+
     def clear_log(self):
         self.log_widget.config(state=tk.NORMAL)
-        self.log_widget.delete('1.0', tk.END)
+        # replace() clears the buffer in one Tcl operation instead of a
+        # delete that walks every line's tags and marks.
+        self.log_widget.replace('1.0', tk.END, '')
         self.log_widget.config(state=tk.DISABLED)
         self.save_button.config(state=tk.DISABLED)
         self.scraped_df = None
         self.last_analysis = {}
+        self._last_raw_bytes = None
         self.status_label.config(text="Log cleared", fg="gray")
         self.log_message("--- Log Cleared ---")
 